@@ -14,6 +14,16 @@
 #   ALLOW_UNDATED_RSS=1
 #   RAW_PREVIEW=0
 #   DEBUG_RSS_N=0
+#   RSS_PARSER=lxml          (lxml | feedparser)
+#   RSS_WORKERS=8            (동시 RSS 다운로드 수)
+#   NEAR_DUP_THRESHOLD=0        (MinHash-LSH 유사 제목 제거, 0 = off; 켜려면 예: 0.8 + pip install datasketch)
+#   PARALLEL_MIN_ITEMS=200
+#   TERM_MATCHER=auto        (auto: pyahocorasick 있으면 사용 | regex: stdlib re 만 사용)
+#
+# RSS conditional GET cache (ETag / Last-Modified) + GDELT response cache:
+#   USE_FEED_CACHE=1
+#   CACHE_DIR=~/.cache/daily-digest
+#   GDELT_CACHE_TTL=1800     (초; 이 시간 안에 같은 쿼리 재실행이면 GDELT 재요청 생략, 0 = off)
 #
 # HTML preview (local):
 #   WRITE_HTML=1  -> writes preview.html
@@ -32,18 +42,45 @@
 import os
 import re
 import json
+import pickle
 import hashlib
-import textwrap
+import heapq
 import smtplib
-from collections import Counter, defaultdict
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from collections import Counter
 from datetime import datetime, timedelta, timezone
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from email.message import Message
 from email.utils import parsedate_to_datetime
 from typing import List, Dict, Tuple, Optional
 
 import requests
 import feedparser
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from dateutil import parser as dateparser
+
+try:
+    import ahocorasick  # pyahocorasick (optional: single-pass term matching)
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson  # optional: faster JSON encode/decode for GDELT / Slack
+except ImportError:
+    orjson = None
+
+try:
+    from lxml import etree  # optional: streaming RSS parser (see RSS_PARSER)
+except ImportError:
+    etree = None
+
+try:
+    import xxhash  # optional: faster 64-bit stable_id
+except ImportError:
+    xxhash = None
 
 # -----------------------------
 # Timezones
@@ -54,7 +91,35 @@ UTC = timezone.utc
 RECENT_HOURS = int(os.getenv("RECENT_HOURS", "72"))
 ALLOW_UNDATED_RSS = os.getenv("ALLOW_UNDATED_RSS", "1") == "1"
 DEBUG_RSS_N = int(os.getenv("DEBUG_RSS_N", "0"))
+RSS_PARSER = os.getenv("RSS_PARSER", "lxml").strip().lower()
+RSS_WORKERS = int(os.getenv("RSS_WORKERS", "8"))
+TERM_MATCHER = os.getenv("TERM_MATCHER", "auto").strip().lower()  # auto | regex
 RAW_PREVIEW = int(os.getenv("RAW_PREVIEW", "0"))
+PARALLEL_MIN_ITEMS = int(os.getenv("PARALLEL_MIN_ITEMS", "200"))  # 이보다 많을 때만 프로세스 풀 사용
+NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0"))  # MinHash-LSH Jaccard, 0 = off
+
+USE_FEED_CACHE = os.getenv("USE_FEED_CACHE", "1") == "1"
+CACHE_DIR = os.path.expanduser(os.getenv("CACHE_DIR", "~/.cache/daily-digest"))
+FEED_META_PATH = os.path.join(CACHE_DIR, "feed_meta.json")
+GDELT_CACHE_TTL = int(os.getenv("GDELT_CACHE_TTL", "1800"))
+FEED_CACHE_VERSION = 4  # bump when the pickled item dict layout changes
+# 캐시된 item의 id는 해시 함수에 따라 달라짐 -> xxhash 유무가 바뀌면 캐시도 무효
+FEED_CACHE_TAG = f"{FEED_CACHE_VERSION}:{'xxh3' if xxhash is not None else 'blake2b'}"
+
+# -----------------------------
+# HTTP (shared keep-alive session for GDELT / RSS / Slack)
+# - pool_maxsize >= RSS_WORKERS: 동시 피드 다운로드가 같은 호스트 커넥션을 버리지 않도록
+# -----------------------------
+_HTTP = requests.Session()
+_HTTP.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=max(16, RSS_WORKERS),
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+))
+_HTTP.headers.update({
+    "Accept-Encoding": "gzip, deflate",
+    "User-Agent": "daily-digest-rss/1.0 (+python-requests)",
+})
 
 # -----------------------------
 # RSS Feeds (Google News)
@@ -111,53 +176,117 @@ THEME_HINTS = {
     "기타": "단기 이벤트성/개별 이슈",
 }
 
+# Lowercased once at import (keyword tables are static)
+_KEYWORDS_LC = tuple((k.lower(), w) for k, w in KEYWORDS.items())
+_THEMES_LC = [(theme, tuple(k.lower() for k in keys)) for theme, keys in THEMES.items()]
+
+# 역방향 인덱스: 매칭된 term -> 가중치 / 테마 번호 (THEMES 순서)
+# found는 보통 몇 개뿐이라 전체 키워드/테마 표를 도는 것보다 found 쪽을 도는 게 쌈
+_KW_WEIGHT = dict(_KEYWORDS_LC)
+_THEME_NAMES = tuple(theme for theme, _ in _THEMES_LC)
+_THEMES_INV: Dict[str, Tuple[int, ...]] = {}
+for _i, (_, _keys) in enumerate(_THEMES_LC):
+    for _k in _keys:
+        _THEMES_INV[_k] = _THEMES_INV.get(_k, ()) + (_i,)
+
 # -----------------------------
 # Utils
 # -----------------------------
+_WS_RE = re.compile(r"\s+")
+
+
+def json_loads(data: bytes):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def json_dumps(obj) -> bytes:
+    return orjson.dumps(obj) if orjson is not None else json.dumps(obj).encode("utf-8")
+
+
 def norm(s: str) -> str:
-    s = (s or "").strip()
-    s = re.sub(r"\s+", " ", s)
-    return s
+    return _WS_RE.sub(" ", (s or "").strip())
 
 
-def stable_id(title: str, link: str) -> str:
-    base = f"{norm(title).lower()}|{norm(link).lower()}"
-    return hashlib.sha256(base.encode("utf-8")).hexdigest()
+def stable_id(title: str, link: str) -> int:
+    # title/link는 수집 단계에서 이미 norm() 처리됨
+    # dedupe 용 set 키로만 쓰이므로 hex 문자열 대신 64-bit int (작고 해시/비교가 빠름)
+    base = f"{title.lower()}|{link.lower()}".encode("utf-8")
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(base)
+    return int.from_bytes(hashlib.blake2b(base, digest_size=8).digest(), "big")
 
 
-def fuzzy_key(title: str) -> str:
-    t = re.sub(r"[^0-9a-zA-Z가-힣\s]", " ", (title or "").lower())
-    t = re.sub(r"\s+", " ", t).strip()
-    return t[:80]
+class _FuzzyTable(dict):
+    """str.translate 표: 영숫자/한글 음절/공백은 그대로, 나머지는 공백 (처음 본 문자만 계산 후 캐시)"""
 
+    def __missing__(self, c: int):
+        ch = chr(c)
+        keep = ch.isspace() or "0" <= ch <= "9" or "a" <= ch <= "z" or "A" <= ch <= "Z" or "가" <= ch <= "힣"
+        r = self[c] = c if keep else 0x20
+        return r
 
-def within_last_hours(dt: Optional[datetime], hours: int) -> bool:
-    if dt is None:
-        return False
-    now = datetime.now(UTC)
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=UTC)
-    return dt >= (now - timedelta(hours=hours))
+
+_FUZZY_TABLE = _FuzzyTable()
+
+
+def fuzzy_text(title: str) -> str:
+    # translate 한 번 + split/join (regex 두 번 대신)
+    return " ".join((title or "").lower().translate(_FUZZY_TABLE).split())
+
+
+FUZZY_KEY_LEN = 80
+
+
+def fuzzy_key(ft: str) -> str:
+    # ft = fuzzy_text(title) (dedupe_score가 MinHash와 같이 쓰려고 미리 계산)
+    return ft[:FUZZY_KEY_LEN]
 
 
-def score_text(title: str, summary: str) -> int:
-    text = f"{title} {summary}".lower()
-    score = 0
-    for k, w in KEYWORDS.items():
-        if k.lower() in text:
-            score += w
-    return score
+_TITLE_SEP_RE = re.compile(r"\s+[-–—|]\s+|:\s+")
+TITLE_PART_MIN = 20
 
 
-def classify_themes(title: str, summary: str) -> List[str]:
-    text = f"{title} {summary}".lower()
-    matched = []
-    for theme, keys in THEMES.items():
-        for k in keys:
-            if k.lower() in text:
-                matched.append(theme)
-                break
-    return matched or ["기타"]
+def title_part_key(title: str, ft: Optional[str] = None) -> str:
+    # "헤드라인 - 언론사" / "Reuters: 헤드라인" -> 가장 긴 조각만 (너무 짧으면 키 없음)
+    # 구분자 없는 제목(GDELT 등)은 제목 전체 -> 나중에 오는 "헤드라인 - Reuters" 사본과 맞물림
+    parts = _TITLE_SEP_RE.split(title or "")
+    if len(parts) < 2:
+        best = ft if ft is not None else fuzzy_text(title)
+    else:
+        best = fuzzy_text(max(parts, key=len))
+    return best if len(best) >= TITLE_PART_MIN else ""
+
+
+def recent_cutoff(hours: int) -> datetime:
+    return datetime.now(UTC) - timedelta(hours=hours)
+
+
+def _prepare(it: Dict) -> str:
+    """title+summary 소문자 텍스트를 item에 한 번만 만들어 둠"""
+    text = it.get("_text_lc")
+    if text is None:
+        text = it["_text_lc"] = f"{it.get('title', '')} {it.get('summary', '')}".lower()
+    return text
+
+
+def score_text(found: set) -> int:
+    return sum(_KW_WEIGHT.get(t, 0) for t in found)
+
+
+def classify_themes(found: set) -> List[str]:
+    idx = set()
+    for t in found:
+        idx.update(_THEMES_INV.get(t, ()))
+    return [_THEME_NAMES[i] for i in sorted(idx)] or ["기타"]
+
+
+def map_cpu(fn, args: List) -> List:
+    """CPU-bound per-item work; process pool only for big batches (spawn cost dominates otherwise)"""
+    if len(args) <= PARALLEL_MIN_ITEMS:
+        return [fn(a) for a in args]
+    workers = os.cpu_count() or 2
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(fn, args, chunksize=max(1, -(-len(args) // workers))))
 
 
 def safe_dt_to_str(dt: Optional[datetime]) -> str:
@@ -170,83 +299,265 @@ def safe_dt_to_str(dt: Optional[datetime]) -> str:
 
 # -----------------------------
 # RSS datetime extraction (robust)
+# - feedparser가 이미 UTC struct_time(*_parsed)으로 풀어둔 값을 먼저 사용
+# - 문자열만 있을 때 dateutil + 고정 tz 약어 테이블
 # -----------------------------
+_TZINFOS = {
+    "UTC": 0, "GMT": 0, "UT": 0, "Z": 0,
+    "EST": -5 * 3600, "EDT": -4 * 3600,
+    "CST": -6 * 3600, "CDT": -5 * 3600,
+    "MST": -7 * 3600, "MDT": -6 * 3600,
+    "PST": -8 * 3600, "PDT": -7 * 3600,
+    "KST": 9 * 3600, "JST": 9 * 3600,
+}
+
+
 def get_entry_datetime(e) -> Optional[datetime]:
-    if hasattr(e, "published"):
-        try:
-            return parsedate_to_datetime(e.published)
-        except Exception:
-            pass
-    if hasattr(e, "updated"):
-        try:
-            return parsedate_to_datetime(e.updated)
-        except Exception:
-            pass
-    pp = getattr(e, "published_parsed", None)
-    if pp:
-        try:
-            return datetime(*pp[:6], tzinfo=UTC)
-        except Exception:
-            pass
-    up = getattr(e, "updated_parsed", None)
-    if up:
-        try:
-            return datetime(*up[:6], tzinfo=UTC)
-        except Exception:
-            pass
+    # entry는 FeedParserDict(dict) -> getattr(__getattr__ 경유) 대신 .get 한 번
+    for key in ("published_parsed", "updated_parsed"):
+        st = e.get(key)
+        if st:
+            try:
+                return datetime(*st[:6], tzinfo=UTC)
+            except Exception:
+                pass
+    for key in ("published", "updated"):
+        s = e.get(key)
+        if s:
+            # RFC-822 pubDate(대부분)는 stdlib 파서로 빠르게; 실패하거나 tz를 모르면(KST 등 -> naive) dateutil
+            try:
+                dt = parsedate_to_datetime(s)
+            except Exception:
+                dt = None
+            if dt is None or dt.tzinfo is None:
+                try:
+                    dt = dateparser.parse(s, tzinfos=_TZINFOS)
+                except Exception:
+                    continue
+            # tz 표기가 없으면 UTC로 간주 -> 호출부는 항상 aware datetime 비교
+            return dt if dt.tzinfo is not None else dt.replace(tzinfo=UTC)
     return None
 
 
+# -----------------------------
+# Feed cache (ETag / Last-Modified + parsed items pickle)
+# - feed_meta.json: url -> {"v", "etag", "modified", "parsed_pickle_path"}
+# - 304 Not Modified 이면 지난번에 정규화해 둔 item 목록 재사용 (XML 파싱 생략)
+# -----------------------------
+def load_feed_meta() -> Dict[str, Dict]:
+    if not USE_FEED_CACHE:
+        return {}
+    try:
+        with open(FEED_META_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def save_feed_meta(meta: Dict[str, Dict]) -> None:
+    if not USE_FEED_CACHE:
+        return
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = FEED_META_PATH + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, FEED_META_PATH)
+    except Exception as e:
+        print(f"[WARN] feed meta save failed: {e}")
+
+
+def parsed_pickle_path(url: str) -> str:
+    return os.path.join(CACHE_DIR, f"parsed_{hashlib.sha1(url.encode('utf-8')).hexdigest()}.pkl")
+
+
+def load_pickle(path: Optional[str]):
+    if not path:
+        return None
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+
+def save_pickle(path: str, obj) -> None:
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except Exception as e:
+        print(f"[WARN] feed cache save failed: {e}")
+
+
 # -----------------------------
 # Fetch: RSS
 # -----------------------------
+def _parse_gnews_rss(body: bytes) -> List:
+    # Google News RSS는 <item><title/><link/><pubDate/><description/></item> 만 쓰면 됨
+    # published_parsed는 만들지 않음 -> 날짜는 get_entry_datetime이 pubDate 문자열을 파싱
+    # (RFC-822라 parsedate_to_datetime 빠른 경로, 실패 시에만 dateutil)
+    entries = []
+    for _, el in etree.iterparse(BytesIO(body), events=("end",), tag="item"):
+        entries.append(feedparser.FeedParserDict(
+            title=el.findtext("title") or "",
+            link=el.findtext("link") or "",
+            summary=el.findtext("description") or "",
+            published=el.findtext("pubDate") or "",
+        ))
+        el.clear()
+        while el.getprevious() is not None:
+            del el.getparent()[0]
+    return entries
+
+
+def _fetch_feed(url: str, etag: Optional[str] = None, modified: Optional[str] = None):
+    """feedparser.parse 와 같은 모양(status/etag/modified/entries/bozo)의 결과를 돌려줌"""
+    if RSS_PARSER != "lxml" or etree is None:
+        return feedparser.parse(url, etag=etag, modified=modified)
+
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if modified:
+        headers["If-Modified-Since"] = modified
+    try:
+        r = _HTTP.get(url, headers=headers, timeout=30)
+    except Exception as e:
+        return feedparser.FeedParserDict(entries=[], bozo=1, bozo_exception=e)
+
+    if r.status_code == 304:
+        return feedparser.FeedParserDict(entries=[], bozo=0, status=304)
+    if not r.ok:
+        return feedparser.FeedParserDict(entries=[], bozo=1, status=r.status_code,
+                                         bozo_exception=f"HTTP {r.status_code}")
+
+    try:
+        feed = feedparser.FeedParserDict(entries=_parse_gnews_rss(r.content), bozo=0)
+    except etree.XMLSyntaxError:
+        # 깨진 XML은 관대한 feedparser로
+        feed = feedparser.parse(r.content)
+    feed["status"] = r.status_code
+    feed["etag"] = r.headers.get("ETag")
+    feed["modified"] = r.headers.get("Last-Modified")
+    return feed
+
+
+def _parse_one(url: str, meta: Dict) -> Tuple[str, object, Optional[List[Dict]]]:
+    # 스레드 하나의 예외가 ex.map 전체(다른 피드 결과)를 날리지 않도록 피드 단위로 격리
+    try:
+        return _parse_one_unsafe(url, meta)
+    except Exception as e:
+        return url, feedparser.FeedParserDict(entries=[], bozo=1, bozo_exception=e), None
+
+
+def _parse_one_unsafe(url: str, meta: Dict) -> Tuple[str, object, Optional[List[Dict]]]:
+    # 캐시 포맷이 다르면 조건부 헤더를 보내지 않음 (304가 와도 쓸 수 없으니)
+    if meta.get("v") != FEED_CACHE_TAG:
+        return url, _fetch_feed(url), None
+
+    feed = _fetch_feed(url, etag=meta.get("etag"), modified=meta.get("modified"))
+    if getattr(feed, "status", None) == 304:
+        cached = load_pickle(meta.get("parsed_pickle_path"))
+        if cached is not None:
+            return url, feed, cached
+        # 캐시 파일 유실: 조건부 헤더 없이 다시 받음
+        feed = _fetch_feed(url)
+    return url, feed, None
+
+
+def normalize_rss_entries(entries) -> List[Dict]:
+    """feedparser entries -> item dicts (title/link 필수, 시간창 필터 전)"""
+    rows: List[Dict] = []
+    for idx, e in enumerate(entries, 1):
+        title = norm(e.get("title", ""))
+        link = norm(e.get("link", ""))
+        summary = norm(e.get("summary", ""))
+
+        if not link and e.get("links"):
+            try:
+                link = norm(e["links"][0].get("href", ""))
+            except Exception:
+                pass
+
+        if DEBUG_RSS_N > 0 and idx <= DEBUG_RSS_N:
+            print(f"[RSS][sample {idx}] title={title[:100]}")
+            print(f"[RSS][sample {idx}] link={link[:140]}")
+            print(f"[RSS][sample {idx}] published={e.get('published')} updated={e.get('updated')}")
+
+        if not title or not link:
+            continue
+
+        rows.append({
+            "id": stable_id(title, link),
+            "title": title,
+            "link": link,
+            "summary": summary,
+            "source": "Google News RSS",
+            "dt": get_entry_datetime(e),
+        })
+    return rows
+
+
 def fetch_rss_items(urls: List[str], max_total: int) -> List[Dict]:
     items: List[Dict] = []
-    for url in urls:
-        feed = feedparser.parse(url)
-        entries = getattr(feed, "entries", []) or []
+    if not urls:
+        return items
+
+    meta = load_feed_meta()
+
+    # 네트워크 대기가 대부분이라 피드를 동시에 받고, 정규화는 순서대로(max_total 컷 유지)
+    with ThreadPoolExecutor(max_workers=max(1, min(RSS_WORKERS, len(urls)))) as ex:
+        feeds = list(ex.map(_parse_one, urls, [meta.get(u, {}) for u in urls]))
 
+    per_feed: List[List[Dict]] = []
+    meta_dirty = False
+    for url, feed, cached in feeds:
         if DEBUG_RSS_N > 0:
+            entries_n = len(cached) if cached is not None else len(getattr(feed, "entries", []) or [])
             print(f"[RSS] url={url}")
-            print(f"[RSS] entries={len(entries)} bozo={getattr(feed,'bozo',None)} status={getattr(feed,'status',None)}")
+            print(f"[RSS] entries={entries_n} bozo={getattr(feed,'bozo',None)} status={getattr(feed,'status',None)} cached={cached is not None}")
             if getattr(feed, "bozo", 0):
                 print(f"[RSS] bozo_exception={getattr(feed,'bozo_exception',None)}")
 
-        for idx, e in enumerate(entries, 1):
-            title = norm(getattr(e, "title", ""))
-            link = norm(getattr(e, "link", ""))
-            summary = norm(getattr(e, "summary", ""))
-
-            if (not link) and hasattr(e, "links") and e.links:
-                try:
-                    link = norm(e.links[0].get("href", ""))
-                except Exception:
-                    pass
-
-            if DEBUG_RSS_N > 0 and idx <= DEBUG_RSS_N:
-                print(f"[RSS][sample {idx}] title={title[:100]}")
-                print(f"[RSS][sample {idx}] link={link[:140]}")
-                print(f"[RSS][sample {idx}] published={getattr(e,'published',None)} updated={getattr(e,'updated',None)}")
-
-            if not title or not link:
-                continue
+        if cached is not None:
+            per_feed.append(cached)
+            continue
 
-            dt = get_entry_datetime(e)
+        rows = normalize_rss_entries(getattr(feed, "entries", []) or [])
+        per_feed.append(rows)
+
+        # 정규화 결과(시간창 필터 전)를 저장 -> 304 때 XML 파싱/정규화 모두 생략
+        etag = getattr(feed, "etag", None)
+        modified = getattr(feed, "modified", None)
+        if USE_FEED_CACHE and rows and (etag or modified):
+            path = parsed_pickle_path(url)
+            save_pickle(path, rows)
+            meta[url] = {
+                "v": FEED_CACHE_TAG,
+                "etag": etag,
+                "modified": modified,
+                "parsed_pickle_path": path,
+            }
+            meta_dirty = True
+
+    if meta_dirty:
+        save_feed_meta(meta)
+
+    # 시간창은 매 실행마다 움직이므로 캐시 히트여도 다시 적용
+    cutoff = recent_cutoff(RECENT_HOURS)
+    for rows in per_feed:
+        for it in rows:
+            dt = it["dt"]
             if dt is None:
                 if not ALLOW_UNDATED_RSS:
                     continue
-            else:
-                if not within_last_hours(dt, RECENT_HOURS):
-                    continue
+            elif dt < cutoff:
+                continue
 
-            items.append({
-                "id": stable_id(title, link),
-                "title": title,
-                "link": link,
-                "summary": summary,
-                "source": "Google News RSS",
-                "dt": dt,
-            })
+            items.append(dict(it))
 
             if len(items) >= max_total:
                 return items
@@ -261,11 +572,35 @@ def gdelt_dt(dt_utc: datetime) -> str:
     return dt_utc.strftime("%Y%m%d%H%M%S")
 
 
+def gdelt_cache_path(query: str, max_records: int) -> Optional[str]:
+    if not USE_FEED_CACHE or GDELT_CACHE_TTL <= 0:
+        return None
+    key = f"{FEED_CACHE_TAG}|{query}|{max_records}|{RECENT_HOURS}"
+    return os.path.join(CACHE_DIR, f"gdelt_{hashlib.sha1(key.encode('utf-8')).hexdigest()}.pkl")
+
+
+def gdelt_cache_fresh(cached, now: datetime) -> bool:
+    # 잘린/옛 포맷/엉뚱한 pickle은 읽기 실패와 똑같이 캐시 miss 처리
+    if not isinstance(cached, dict):
+        return False
+    at, items = cached.get("at"), cached.get("items")
+    if not isinstance(at, datetime) or at.tzinfo is None or not isinstance(items, list):
+        return False
+    return (now - at).total_seconds() < GDELT_CACHE_TTL
+
+
 def fetch_gdelt_last_hours(query: str, max_records: int) -> List[Dict]:
     base = "https://api.gdeltproject.org/api/v2/doc/doc"
-    end = datetime.utcnow()
+    # 시계는 한 번만 읽음 (RSS와 같은 cutoff 계산, aware UTC)
+    end = datetime.now(UTC)
     start = end - timedelta(hours=RECENT_HOURS)
 
+    # 같은 (쿼리, 개수, 시간창)을 TTL 안에 다시 돌리면 지난 응답의 item 재사용
+    cache_path = gdelt_cache_path(query, max_records)
+    cached = load_pickle(cache_path)
+    if gdelt_cache_fresh(cached, end):
+        return [dict(it) for it in cached["items"]]
+
     params = {
         "query": query,
         "mode": "ArtList",
@@ -276,7 +611,7 @@ def fetch_gdelt_last_hours(query: str, max_records: int) -> List[Dict]:
         "enddatetime": gdelt_dt(end),
     }
 
-    r = requests.get(base, params=params, timeout=30)
+    r = _HTTP.get(base, params=params, timeout=30)
     if not r.ok:
         raise RuntimeError(f"GDELT HTTP {r.status_code}: {r.text[:300]}")
 
@@ -285,7 +620,7 @@ def fetch_gdelt_last_hours(query: str, max_records: int) -> List[Dict]:
         raise RuntimeError(f"GDELT non-JSON response (content-type={ct}): {r.text[:300]}")
 
     try:
-        data = r.json()
+        data = json_loads(r.content)
     except Exception as e:
         raise RuntimeError(f"GDELT JSON decode failed: {e}; body head={r.text[:300]}")
 
@@ -299,7 +634,8 @@ def fetch_gdelt_last_hours(query: str, max_records: int) -> List[Dict]:
             continue
 
         dt = None
-        sd = norm(a.get("seendate", ""))
+        # seendate 예: "20240101T123000Z" -> 숫자만 남겨서 파싱
+        sd = (a.get("seendate") or "").replace("T", "").replace("Z", "")
         if sd.isdigit() and len(sd) >= 14:
             try:
                 dt = datetime.strptime(sd[:14], "%Y%m%d%H%M%S").replace(tzinfo=UTC)
@@ -315,38 +651,89 @@ def fetch_gdelt_last_hours(query: str, max_records: int) -> List[Dict]:
             "dt": dt,
         })
 
+    if cache_path and items:
+        save_pickle(cache_path, {"at": end, "items": items})
     return items
 
 
 # -----------------------------
 # Dedupe + score + themes
 # -----------------------------
+# near-dup은 opt-in: "rises"/"falls", "인상"/"인하"처럼 한 단어 차이가 시그널이라 기본은 끔
+# datasketch(numpy/scipy) import도 켰을 때만
+MinHash = MinHashLSH = None
+if NEAR_DUP_THRESHOLD > 0:
+    try:
+        from datasketch import MinHash, MinHashLSH  # optional: near-duplicate titles
+    except ImportError:
+        pass
+
+_MINHASH_PERM = 64
+# 순열은 한 번만 만들고 모든 MinHash가 공유 (빈 템플릿을 copy -> permutations 재생성 없음)
+_MINHASH_TMPL = MinHash(num_perm=_MINHASH_PERM) if MinHash is not None else None
+
+
+def title_minhash(t: str):
+    # t = fuzzy_text(title); 단어 2-gram shingle (문자 n-gram은 한 단어 차이 제목도 묶어버림)
+    words = t.split()
+    shingles = {" ".join(words[i:i + 2]) for i in range(max(1, len(words) - 1))}
+    m = _MINHASH_TMPL.copy()
+    m.update_batch([s.encode("utf-8") for s in shingles])
+    return m
+
+
+def _score_one(text_lc: str) -> Tuple[set, int, List[str], Dict]:
+    # 매칭 한 번으로 점수/테마/시그널까지 (prepare_report에서 다시 돌지 않음)
+    found = match_terms(text_lc)
+    score = score_text(found)
+    themes = classify_themes(found)
+    return found, score, themes, analyze_signal(found, themes, score)
+
+
 def dedupe_score(items: List[Dict], top_n: int) -> List[Dict]:
     seen_id = set()
     seen_fuzzy = set()
+    seen_part = set()
     out: List[Dict] = []
 
-    for it in items:
-        sid = it.get("id") or stable_id(it.get("title", ""), it.get("link", ""))
-        fk = fuzzy_key(it.get("title", ""))
+    # exact(id) -> prefix(fuzzy_key) -> 제목 조각(언론사 접두/접미 제거) -> near-dup(MinHash-LSH) 순서로 걸러냄
+    lsh = None
+    if MinHashLSH is not None and NEAR_DUP_THRESHOLD > 0:
+        lsh = MinHashLSH(threshold=NEAR_DUP_THRESHOLD, num_perm=_MINHASH_PERM)
 
+    for it in items:
+        sid = it["id"]  # fetch_rss_items / fetch_gdelt_last_hours가 항상 채움
         if sid in seen_id:
             continue
+        ft = fuzzy_text(it.get("title", ""))  # 소문자/정규화는 한 번만: prefix key와 MinHash가 같이 씀
+        fk = fuzzy_key(ft)
         if fk in seen_fuzzy:
             continue
+        tp = title_part_key(it.get("title", ""), ft)
+        if tp and tp in seen_part:
+            continue
+        if lsh is not None:
+            m = title_minhash(ft)
+            if lsh.query(m):
+                continue
+            lsh.insert(sid, m)
 
         seen_id.add(sid)
         seen_fuzzy.add(fk)
+        if tp:
+            seen_part.add(tp)
 
-        title = it.get("title", "")
-        summary = it.get("summary", "")
-        it["id"] = sid
-        it["score"] = score_text(title, summary)
-        it["themes"] = classify_themes(title, summary)
         out.append(it)
 
-    out.sort(key=lambda x: (x.get("score", 0), x.get("title", "")), reverse=True)
-    return out[:top_n]
+    # dedupe는 순차적이어야 하지만 점수/테마는 항목별로 독립
+    for it, (found, score, themes, sig) in zip(out, map_cpu(_score_one, [_prepare(it) for it in out])):
+        it["_terms"] = found
+        it["score"] = score
+        it["themes"] = themes
+        it["signal"] = sig
+
+    # 상위 top_n만 필요 -> 전체 정렬 대신 O(N log top_n)
+    return heapq.nlargest(top_n, out, key=lambda x: (x.get("score", 0), x.get("title", "")))
 
 
 # -----------------------------
@@ -369,24 +756,77 @@ MEDIUM_TERMS = ["jump", "rise", "fall", "drop", "warn", "concern", "weighs", "bo
 DIRECTION_UP_TERMS = ["cut", "dovish", "cooling", "yields fall", "bond rally", "stimulus", "easing", "beats expectations", "record profit"]
 DIRECTION_DOWN_TERMS = ["hike", "hawkish", "hot inflation", "yields surge", "bond selloff", "sanction", "attack", "tension", "oil spike"]
 
+# risk-on/off 판단이 애매할 때 Risk-off 쪽으로 기우는 단어
+RISK_OFF_LEAN_TERMS = ["hawkish", "yield", "war", "attack", "sanction", "oil", "inflation"]
 
-def analyze_signal(title: str, summary: str, themes: List[str], score: int) -> Dict:
-    text = f"{title} {summary}".lower()
 
-    risk_off = any(t in text for t in RISK_OFF_TERMS)
-    risk_on = any(t in text for t in RISK_ON_TERMS)
+# -----------------------------
+# Term matcher
+# - every keyword/theme/signal term in one Aho-Corasick automaton
+# - one pass over the text instead of one `in` scan per term
+# - without pyahocorasick (or TERM_MATCHER=regex): one compiled regex alternation
+#   (also a single C-level scan)
+# -----------------------------
+_ALL_TERMS = tuple(sorted(
+    {k for k, _ in _KEYWORDS_LC}
+    | {k for _, keys in _THEMES_LC for k in keys}
+    | {t.lower() for t in (RISK_OFF_TERMS + RISK_ON_TERMS + STRONG_TERMS + MEDIUM_TERMS
+                           + DIRECTION_UP_TERMS + DIRECTION_DOWN_TERMS + RISK_OFF_LEAN_TERMS)}
+))
+
+if ahocorasick is not None and TERM_MATCHER != "regex":
+    _AC = ahocorasick.Automaton()
+    for _t in _ALL_TERMS:
+        _AC.add_word(_t, _t)
+    _AC.make_automaton()
+else:
+    _AC = None
+
+# Fallback: lookahead alternation, longest term first -> the longest term starting at
+# each position. Shorter terms that sit inside it ("yield" in "yields surge") are
+# recovered from _SUBTERMS, so the result equals checking every term with `in`.
+_TERMS_RE = re.compile(
+    "(?=(" + "|".join(re.escape(t) for t in sorted(_ALL_TERMS, key=len, reverse=True)) + "))"
+)
+_SUBTERMS = {t: frozenset(u for u in _ALL_TERMS if u in t) for t in _ALL_TERMS}
+
+
+# analyze_signal용 frozenset (found와 교집합 검사: 리스트 순회 대신 작은 쪽 기준 해시 조회)
+_RISK_OFF = frozenset(RISK_OFF_TERMS)
+_RISK_ON = frozenset(RISK_ON_TERMS)
+_RISK_OFF_LEAN = frozenset(RISK_OFF_LEAN_TERMS)
+_STRONG = frozenset(STRONG_TERMS)
+_MEDIUM = frozenset(MEDIUM_TERMS)
+_DIRECTION_UP = frozenset(DIRECTION_UP_TERMS)
+_DIRECTION_DOWN = frozenset(DIRECTION_DOWN_TERMS)
+_MACRO_THEMES = frozenset(["금리/연준/물가", "환율/달러/국채", "지정학/원자재"])
+
+
+def match_terms(text: str) -> set:
+    """Return the set of known terms contained in `text` (already lowercased)."""
+    if _AC is not None:
+        return {t for _, t in _AC.iter(text)}
+    found = set()
+    for t in set(_TERMS_RE.findall(text)):
+        found |= _SUBTERMS[t]
+    return found
+
+
+def analyze_signal(found: set, themes: List[str], score: int) -> Dict:
+    risk_off = not found.isdisjoint(_RISK_OFF)
+    risk_on = not found.isdisjoint(_RISK_ON)
     if risk_off and not risk_on:
         risk_mode = "Risk-off"
     elif risk_on and not risk_off:
         risk_mode = "Risk-on"
     else:
-        if any(k in text for k in ["hawkish", "yield", "war", "attack", "sanction", "oil", "inflation"]):
+        if not found.isdisjoint(_RISK_OFF_LEAN):
             risk_mode = "Risk-off"
         else:
             risk_mode = "Mixed"
 
-    down = any(t in text for t in DIRECTION_DOWN_TERMS)
-    up = any(t in text for t in DIRECTION_UP_TERMS)
+    down = not found.isdisjoint(_DIRECTION_DOWN)
+    up = not found.isdisjoint(_DIRECTION_UP)
     if up and not down:
         direction = "↑"
     elif down and not up:
@@ -397,12 +837,12 @@ def analyze_signal(title: str, summary: str, themes: List[str], score: int) -> D
     strength_score = 0
     strength_score += min(6, score)
 
-    if any(t in text for t in STRONG_TERMS):
+    if not found.isdisjoint(_STRONG):
         strength_score += 4
-    elif any(t in text for t in MEDIUM_TERMS):
+    elif not found.isdisjoint(_MEDIUM):
         strength_score += 2
 
-    if any(t in themes for t in ["금리/연준/물가", "환율/달러/국채", "지정학/원자재"]):
+    if not _MACRO_THEMES.isdisjoint(themes):
         strength_score += 2
 
     if strength_score >= 10:
@@ -423,8 +863,8 @@ def analyze_signal(title: str, summary: str, themes: List[str], score: int) -> D
         trade_action = "관심등록(관망)"
 
     hits = []
-    for k in KEYWORDS.keys():
-        if k.lower() in text:
+    for k, _ in _KEYWORDS_LC:
+        if k in found:
             hits.append(k)
         if len(hits) >= 6:
             break
@@ -442,66 +882,114 @@ def analyze_signal(title: str, summary: str, themes: List[str], score: int) -> D
 # -----------------------------
 # Report (HTML + TEXT)
 # -----------------------------
-def build_report(items: List[Dict]) -> Tuple[str, str, str]:
-    now_kst = datetime.now(UTC).astimezone(KST)
-    subject = f"[Daily Digest] {now_kst:%Y-%m-%d %H:%M} KST"
+# 공통 스타일은 <style> 한 번, 셀마다 inline style 반복하지 않음
+HTML_STYLE = (
+    "<style>"
+    "body{font-family:-apple-system,Segoe UI,Roboto,Arial;font-size:14px;}"
+    ".meta{color:#666;margin-bottom:10px;}"
+    "h2{margin:18px 0 8px;}h2.first{margin-top:14px;}h3{margin:12px 0 6px;}"
+    "table{border-collapse:collapse;width:100%;max-width:900px;}"
+    "th,td{border:1px solid #ddd;padding:8px;}"
+    "th{background:#f3f3f3;text-align:left;}"
+    "td.k{background:#fafafa;width:140px;vertical-align:top;}"
+    "td.v{vertical-align:top;}"
+    "</style>"
+)
+TR_TMPL = "<tr><td class='k'><b>{k}</b></td><td class='v'>{v}</td></tr>"
+THEME_HEAD_HTML = "<tr><th>테마</th><th>관련 뉴스(Top)</th><th>시그널</th><th>강도</th></tr>"
+THEME_ROW_TMPL = "<tr><td>{th}</td><td>{news}</td><td>{mode}</td><td>{stars}</td></tr>"
+
+_HTML_ESC_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;"})
+
+
+def esc(s: str) -> str:
+    return (s or "").translate(_HTML_ESC_TABLE)
+
+
+CHECKLIST = [
+    "프리마켓/선물: 나스닥 선물 방향",
+    "미국채(10Y/2Y) 금리 급등/급락",
+    "달러인덱스(DXY) & USD/KRW 갭",
+    "WTI/Brent 유가 급등 여부",
+    "테마 로테이션: 반도체/AI vs 방산/정유 vs 은행",
+    "장 초반 15분 변동성(휩쏘) 경계",
+]
 
+
+def prepare_report(items: List[Dict]) -> Dict:
+    """signal 분석/정렬/테마 요약 -> build_subject/build_text/build_html 공용 입력"""
     enriched = []
     strength_rank = {"상": 3, "중": 2, "하": 1}
 
+    # dedupe_score를 거친 항목은 signal이 이미 붙어 있음 -> 없는 것만 같은 _score_one 경로로 분석
+    todo = [it for it in items if "signal" not in it]
+    fresh = {id(it): r for it, r in zip(todo, map_cpu(_score_one, [_prepare(it) for it in todo]))}
     for it in items:
-        sig = analyze_signal(
-            it.get("title", ""),
-            it.get("summary", ""),
-            it.get("themes", ["기타"]),
-            it.get("score", 0),
-        )
         it2 = dict(it)
-        it2["signal"] = sig
+        if id(it) in fresh:
+            it2["_terms"], it2["score"], it2["themes"], it2["signal"] = fresh[id(it)]
+        sig = it2["signal"]
+        it2["_rank"] = strength_rank.get(sig["strength"], 1)
+        themes = it2.get("themes") or ["기타"]
+        it2["_themes_str"] = ", ".join(themes)
+        it2["_hint"] = THEME_HINTS.get(themes[0], THEME_HINTS["기타"])
         enriched.append(it2)
 
-    enriched.sort(key=lambda x: (strength_rank.get(x["signal"]["strength"], 1), x.get("score", 0)), reverse=True)
-
-    top3 = enriched[:3]
+    enriched.sort(key=lambda x: (x["_rank"], x.get("score", 0)), reverse=True)
 
-    theme_buckets: Dict[str, List[Dict]] = defaultdict(list)
+    # 테마별 상위 2개만 필요: enriched는 이미 정렬됨 -> 모든 버킷이 차면 중단
+    theme_order = list(THEMES.keys()) + ["기타"]
+    theme_top2: Dict[str, List[Dict]] = {th: [] for th in theme_order}
+    remaining = len(theme_top2) * 2
     for it in enriched:
         for th in it.get("themes", ["기타"]):
-            theme_buckets[th].append(it)
+            bucket = theme_top2.get(th)
+            if bucket is not None and len(bucket) < 2:
+                bucket.append(it)
+                remaining -= 1
+        if remaining == 0:
+            break
 
-    theme_order = list(THEMES.keys()) + ["기타"]
     theme_rows = []
     for th in theme_order:
-        if th not in theme_buckets:
-            continue
-        best = theme_buckets[th][:2]
+        best = theme_top2[th]
         if not best:
             continue
         news_titles = " / ".join([b["title"][:55] + ("…" if len(b["title"]) > 55 else "") for b in best])
-        max_sig = max(best, key=lambda x: strength_rank.get(x["signal"]["strength"], 1))["signal"]
+        # 버킷은 정렬된 enriched 순서대로 채워짐 -> 첫 항목이 강도 최댓값
+        max_sig = best[0]["signal"]
         theme_rows.append((th, news_titles, max_sig["risk_mode"], max_sig["stars"]))
 
-    checklist = [
-        "프리마켓/선물: 나스닥 선물 방향",
-        "미국채(10Y/2Y) 금리 급등/급락",
-        "달러인덱스(DXY) & USD/KRW 갭",
-        "WTI/Brent 유가 급등 여부",
-        "테마 로테이션: 반도체/AI vs 방산/정유 vs 은행",
-        "장 초반 15분 변동성(휩쏘) 경계",
-    ]
+    return {
+        "now_kst": datetime.now(UTC).astimezone(KST),
+        "items_n": len(items),
+        "enriched": enriched,
+        "top3": enriched[:3],
+        "theme_rows": theme_rows,
+    }
+
+
+def build_subject(report: Dict) -> str:
+    return f"[Daily Digest] {report['now_kst']:%Y-%m-%d %H:%M} KST"
+
+
+def build_text(report: Dict) -> str:
+    now_kst = report["now_kst"]
+    enriched = report["enriched"]
+    top3 = report["top3"]
+    theme_rows = report["theme_rows"]
 
-    # TEXT fallback
     t = []
-    t.append(f"Daily Digest ({now_kst:%Y-%m-%d %H:%M} KST) / Window: last {RECENT_HOURS}h / items: {len(items)}")
+    t.append(f"Daily Digest ({now_kst:%Y-%m-%d %H:%M} KST) / Window: last {RECENT_HOURS}h / items: {report['items_n']}")
     t.append("")
     t.append("== Top 3 ==")
     for i, it in enumerate(top3, 1):
         sig = it["signal"]
-        ths = ", ".join(it.get("themes", ["기타"]))
+        ths = it["_themes_str"]
         title = it.get("title", "")
         link = it.get("link", "")
         t.append(f"{i}. [{sig['risk_mode']}/{sig['direction']}/{sig['strength']}{sig['stars']}] {title}")
-        t.append(f"   - themes: {ths} / score={it.get('score',0)} / hint: {THEME_HINTS.get(it.get('themes',['기타'])[0], THEME_HINTS['기타'])}")
+        t.append(f"   - themes: {ths} / score={it.get('score',0)} / hint: {it['_hint']}")
         t.append(f"   - action: {sig['trade_action']}")
         t.append(f"   - {link}")
         t.append("")
@@ -511,7 +999,7 @@ def build_report(items: List[Dict]) -> Tuple[str, str, str]:
         t.append(f"- {row[0]} | {row[2]} | {row[3]} | {row[1]}")
     t.append("")
     t.append("== Checklist ==")
-    for c in checklist:
+    for c in CHECKLIST:
         t.append(f"- [ ] {c}")
     t.append("")
     t.append("== Top 10 (browse) ==")
@@ -521,126 +1009,173 @@ def build_report(items: List[Dict]) -> Tuple[str, str, str]:
         link = it.get("link", "")
         t.append(f"{i:02d}. [{sig['risk_mode']}/{sig['direction']}/{sig['strength']}{sig['stars']}] {title} ({link})")
 
-    text_body = "\n".join(t)
+    return "\n".join(t)
 
-    # HTML primary
-    def esc(s: str) -> str:
-        return (s or "").replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+def build_html(report: Dict) -> str:
+    now_kst = report["now_kst"]
+    enriched = report["enriched"]
+    top3 = report["top3"]
+    theme_rows = report["theme_rows"]
 
     html = []
-    html.append("<html><body style='font-family:-apple-system,Segoe UI,Roboto,Arial;font-size:14px;'>")
-    html.append(f"<div style='color:#666;margin-bottom:10px;'>Generated: {now_kst:%Y-%m-%d %H:%M} KST · Window: last {RECENT_HOURS}h · items: {len(items)}</div>")
+    html.append(f"<html><head><meta charset='utf-8'>{HTML_STYLE}</head><body>")
+    html.append(f"<div class='meta'>Generated: {now_kst:%Y-%m-%d %H:%M} KST · Window: last {RECENT_HOURS}h · items: {report['items_n']}</div>")
 
-    html.append("<h2 style='margin:14px 0 8px;'>📰 Top 3</h2>")
+    html.append("<h2 class='first'>📰 Top 3</h2>")
     for i, it in enumerate(top3, 1):
         sig = it["signal"]
-        ths = ", ".join(it.get("themes", ["기타"]))
+        ths = it["_themes_str"]
         title = esc(it.get("title", ""))
-        link = it.get("link", "")
+        link = esc(it.get("link", ""))
         summary = esc(it.get("summary", "") or "(요약 없음)")
-        hint = esc(THEME_HINTS.get(it.get("themes", ["기타"])[0], THEME_HINTS["기타"]))
+        hint = esc(it["_hint"])
         hits = esc(", ".join(sig["hits"]) if sig.get("hits") else "-")
         src = esc(it.get("source", ""))
         dt_str = esc(safe_dt_to_str(it.get("dt")))
 
-        html.append(f"<h3 style='margin:12px 0 6px;'>🔥 {i}순위: <a href='{link}'>{title}</a></h3>")
-        html.append("<table style='border-collapse:collapse;width:100%;max-width:900px;'>")
-
-        def tr(k, v):
-            html.append(
-                "<tr>"
-                f"<td style='border:1px solid #ddd;padding:8px;background:#fafafa;width:140px;vertical-align:top;'><b>{k}</b></td>"
-                f"<td style='border:1px solid #ddd;padding:8px;vertical-align:top;'>{v}</td>"
-                "</tr>"
-            )
-
-        tr("뉴스 요약", summary[:220] + ("…" if len(summary) > 220 else ""))
-        tr("시장 영향", esc(sig["risk_mode"]))
-        tr("방향/강도", f"{esc(sig['direction'])} · {esc(sig['strength'])} {esc(sig['stars'])}")
-        tr("관련 테마", esc(ths))
-        tr("테마 힌트", hint)
-        tr("매매 전략", esc(sig["trade_action"]))
-        tr("체크 키워드", hits)
-        tr("소스/시간", f"{src}{(' / ' + dt_str) if dt_str else ''}")
-
+        html.append(f"<h3>🔥 {i}순위: <a href='{link}'>{title}</a></h3>")
+        html.append("<table>")
+        for k, v in (
+            ("뉴스 요약", summary[:220] + ("…" if len(summary) > 220 else "")),
+            ("시장 영향", esc(sig["risk_mode"])),
+            ("방향/강도", f"{esc(sig['direction'])} · {esc(sig['strength'])} {esc(sig['stars'])}"),
+            ("관련 테마", esc(ths)),
+            ("테마 힌트", hint),
+            ("매매 전략", esc(sig["trade_action"])),
+            ("체크 키워드", hits),
+            ("소스/시간", f"{src}{(' / ' + dt_str) if dt_str else ''}"),
+        ):
+            html.append(TR_TMPL.format_map({"k": k, "v": v}))
         html.append("</table>")
 
-    html.append("<h2 style='margin:18px 0 8px;'>📊 Themes</h2>")
-    html.append("<table style='border-collapse:collapse;width:100%;max-width:900px;'>")
-    html.append(
-        "<tr>"
-        "<th style='border:1px solid #ddd;padding:8px;background:#f3f3f3;text-align:left;'>테마</th>"
-        "<th style='border:1px solid #ddd;padding:8px;background:#f3f3f3;text-align:left;'>관련 뉴스(Top)</th>"
-        "<th style='border:1px solid #ddd;padding:8px;background:#f3f3f3;text-align:left;'>시그널</th>"
-        "<th style='border:1px solid #ddd;padding:8px;background:#f3f3f3;text-align:left;'>강도</th>"
-        "</tr>"
-    )
+    html.append("<h2>📊 Themes</h2>")
+    html.append("<table>")
+    html.append(THEME_HEAD_HTML)
     for th, news_titles, sig_mode, stars in theme_rows[:10]:
-        html.append(
-            "<tr>"
-            f"<td style='border:1px solid #ddd;padding:8px;'>{esc(th)}</td>"
-            f"<td style='border:1px solid #ddd;padding:8px;'>{esc(news_titles)}</td>"
-            f"<td style='border:1px solid #ddd;padding:8px;'>{esc(sig_mode)}</td>"
-            f"<td style='border:1px solid #ddd;padding:8px;'>{esc(stars)}</td>"
-            "</tr>"
-        )
+        html.append(THEME_ROW_TMPL.format_map({
+            "th": esc(th), "news": esc(news_titles), "mode": esc(sig_mode), "stars": esc(stars),
+        }))
     html.append("</table>")
 
-    html.append("<h2 style='margin:18px 0 8px;'>✅ Checklist</h2>")
+    html.append("<h2>✅ Checklist</h2>")
     html.append("<ul>")
-    for c in checklist:
+    for c in CHECKLIST:
         html.append(f"<li>{esc(c)}</li>")
     html.append("</ul>")
 
-    html.append("<h2 style='margin:18px 0 8px;'>🧾 Top 10 (browse)</h2>")
+    html.append("<h2>🧾 Top 10 (browse)</h2>")
     html.append("<ol>")
     for it in enriched[:10]:
         sig = it["signal"]
         title = esc(it.get("title", ""))
-        link = it.get("link", "")
+        link = esc(it.get("link", ""))
         html.append(f"<li>[{esc(sig['risk_mode'])}/{esc(sig['direction'])}/{esc(sig['strength'])}{esc(sig['stars'])}] <a href='{link}'>{title}</a></li>")
     html.append("</ol>")
 
     html.append("</body></html>")
-    html_body = "\n".join(html)
-
-    return subject, text_body, html_body
+    return "\n".join(html)
 
 
 # -----------------------------
 # Delivery: Slack + Email(SMTP)
 # -----------------------------
+SLACK_CHUNK = 3500
+
+
+def _slack_chunks(text: str, limit: int = SLACK_CHUNK):
+    # limit 글자 창 안의 마지막 줄바꿈에서 슬라이스 (줄 split/join 없이 한 번 훑음)
+    # 창 안에 줄바꿈이 없으면 limit에서 강제 분할
+    start, n = 0, len(text)
+    while n - start > limit:
+        cut = text.rfind("\n", start, start + limit + 1)
+        if cut <= start:
+            yield text[start:start + limit]
+            start += limit
+        else:
+            yield text[start:cut]
+            start = cut + 1
+    if start < n:
+        yield text[start:]
+
+
+def _post_slack(webhook_url: str, payload: Dict) -> None:
+    r = _HTTP.post(webhook_url, data=json_dumps(payload), headers={"Content-Type": "application/json"}, timeout=20)
+    r.raise_for_status()
+
+
 def send_slack(webhook_url: str, text: str) -> None:
-    chunks = textwrap.wrap(text, width=3500, break_long_words=False, replace_whitespace=False)
+    if len(text) <= SLACK_CHUNK:
+        _post_slack(webhook_url, {"text": f"```{text}```"})
+        return
+
+    chunks = list(_slack_chunks(text))
     for idx, chunk in enumerate(chunks, 1):
         payload = {"text": f"*Part {idx}/{len(chunks)}*\n```{chunk}```" if len(chunks) > 1 else f"```{chunk}```"}
-        r = requests.post(webhook_url, data=json.dumps(payload), headers={"Content-Type": "application/json"}, timeout=20)
-        r.raise_for_status()
+        _post_slack(webhook_url, payload)
 
 
-def send_email_smtp(host: str, port: int, user: str, pw: str,
-                    mail_from: str, mail_to: str, subject: str,
-                    text_body: str, html_body: str) -> None:
-    msg = MIMEMultipart("alternative")
+def build_email(mail_from: str, mail_to: str, subject: str,
+                text_body: str, html_body: Optional[str] = None) -> Message:
+    if html_body:
+        # multipart/alternative: 클라이언트는 마지막(가장 풍부한) 파트를 고름 -> plain 먼저, html 나중
+        msg = MIMEMultipart("alternative")
+        msg.attach(MIMEText(text_body, "plain", "utf-8"))
+        msg.attach(MIMEText(html_body, "html", "utf-8"))
+    else:
+        msg = MIMEText(text_body, "plain", "utf-8")
     msg["From"] = mail_from
     msg["To"] = mail_to
     msg["Subject"] = subject
+    return msg
 
-    msg.attach(MIMEText(text_body, "plain", "utf-8"))
-    msg.attach(MIMEText(html_body, "html", "utf-8"))
 
+def open_smtp(host: str, port: int, user: str, pw: str) -> smtplib.SMTP:
     if port == 465:
-        with smtplib.SMTP_SSL(host, port, timeout=30) as s:
-            s.ehlo()
-            s.login(user, pw)
-            s.send_message(msg)
+        s = smtplib.SMTP_SSL(host, port, timeout=30)
     else:
-        with smtplib.SMTP(host, port, timeout=30) as s:
+        s = smtplib.SMTP(host, port, timeout=30)
+    # 핸드셰이크/인증 실패(잘못된 계정 등) 시 소켓을 닫고 예외 전달
+    try:
+        if port != 465:
             s.ehlo()
             s.starttls()
-            s.ehlo()
-            s.login(user, pw)
-            s.send_message(msg)
+        s.ehlo()
+        s.login(user, pw)
+    except Exception:
+        s.close()
+        raise
+    return s
+
+
+def close_smtp(server: Optional[smtplib.SMTP]) -> None:
+    if server is None:
+        return
+    try:
+        server.quit()
+    except Exception:
+        try:
+            server.close()
+        except Exception:
+            pass
+
+
+def send_email_smtp(host: str, port: int, user: str, pw: str,
+                    mail_from: str, mail_to: str, subject: str,
+                    text_body: str, html_body: Optional[str] = None) -> None:
+    # MAIL_TO="a@x.com, b@y.com" -> 한 번의 DATA 전송으로 전원에게 (본문 업로드 1회)
+    rcpts = [a.strip() for a in mail_to.split(",") if a.strip()]
+    # 메시지 직렬화는 한 번만 (To 헤더는 MAIL_TO 그대로)
+    raw = build_email(mail_from, mail_to, subject, text_body, html_body).as_bytes()
+
+    server = open_smtp(host, port, user, pw)
+    try:
+        # 일부 수신자만 거부되면 sendmail은 거부 목록(dict)을 돌려줌 (전원 거부일 때만 예외)
+        refused = server.sendmail(mail_from, rcpts, raw)
+        if refused:
+            print(f"[WARN] Email rejected for some recipients: {refused}")
+    finally:
+        close_smtp(server)
 
 
 # -----------------------------
@@ -669,17 +1204,22 @@ def main():
 
     items: List[Dict] = []
 
-    if gdelt_max > 0:
-        try:
-            items += fetch_gdelt_last_hours(gdelt_query, gdelt_max)
-        except Exception as e:
-            print(f"[WARN] GDELT fetch failed: {e}")
+    # GDELT / RSS 동시 수집 (결과 병합 순서는 GDELT -> RSS 유지)
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        gdelt_fut = ex.submit(fetch_gdelt_last_hours, gdelt_query, gdelt_max) if gdelt_max > 0 else None
+        rss_fut = ex.submit(fetch_rss_items, RSS_FEEDS, rss_max) if use_rss else None
 
-    if use_rss:
-        try:
-            items += fetch_rss_items(RSS_FEEDS, rss_max)
-        except Exception as e:
-            print(f"[WARN] RSS fetch failed: {e}")
+        if gdelt_fut is not None:
+            try:
+                items += gdelt_fut.result()
+            except Exception as e:
+                print(f"[WARN] GDELT fetch failed: {e}")
+
+        if rss_fut is not None:
+            try:
+                items += rss_fut.result()
+            except Exception as e:
+                print(f"[WARN] RSS fetch failed: {e}")
 
     if RAW_PREVIEW > 0:
         print(f"\n[RAW] collected items = {len(items)} (GDELT={'on' if gdelt_max>0 else 'off'}, RSS={'on' if use_rss else 'off'})")
@@ -690,10 +1230,17 @@ def main():
 
     ranked = dedupe_score(items, top_n=60)
 
-    subject, text_body, html_body = build_report(ranked)
+    # text는 항상 필요(stdout 로그 + Slack + 메일 plain 파트), html은 메일/미리보기 때만
+    smtp_ready = bool(smtp_host and smtp_user and smtp_pass and mail_from and mail_to)
+    write_html = os.getenv("WRITE_HTML", "0") == "1"
+
+    report = prepare_report(ranked)
+    subject = build_subject(report)
+    text_body = build_text(report)
+    html_body = build_html(report) if (smtp_ready or write_html) else None
 
     # Local preview
-    if os.getenv("WRITE_HTML", "0") == "1":
+    if write_html:
         with open("preview.html", "w", encoding="utf-8") as f:
             f.write(html_body)
         print("[OK] wrote preview.html")
@@ -707,7 +1254,7 @@ def main():
         except Exception as e:
             print(f"[WARN] Slack send failed: {e}")
 
-    if smtp_host and smtp_user and smtp_pass and mail_from and mail_to:
+    if smtp_ready:
         try:
             send_email_smtp(
                 smtp_host, smtp_port, smtp_user, smtp_pass,